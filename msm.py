@@ -11,82 +11,413 @@ especially for different versions and build types (like release or snapshot).
 
 import os
 import sys
-import json
+import math
+import time
+import base64
+import hashlib
+import functools
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-import urllib.request as requests
-import subprocess
-import argparse
+from types import MappingProxyType
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+
+# ssl, http.client, urllib.request, pickle, concurrent.futures, subprocess and argparse
+# are imported in the functions that need them, they would dominate "import msm"
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional, fall back to the standard library
+    import json as _json
 
 DEFAULT_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
 SERVER_START_COMMAND = "java -Xmx1024M -Xms1024M -jar minecraft_server.1.20.4.jar nogui"
 JAVA_DOWNLOAD_URL_PAGE = "https://adoptium.net/de/temurin/releases/"
 DEFAULT_SERVER_FOLDER = Path("server_versions")
+CACHE_FOLDER_NAME = ".cache"
+USER_AGENT = "msm/1.0"
+HTTP_TIMEOUT = 30
+HTTP_MAX_REDIRECTS = 5
+META_FETCH_WORKERS = 16
+DOWNLOAD_WORKERS = 6
+DOWNLOAD_MIN_CHUNK_SIZE = 8 * 1024
+DOWNLOAD_MAX_CHUNK_SIZE = 1024 * 1024
+PROGRESS_INTERVAL = 0.05
+COMMAND_TIMEOUT = 30
 
+_DECIMAL_UNITS = ("Bytes", "KB", "MB", "GB", "TB", "PB", "EB")
+_BINARY_UNITS = ("Bytes", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB")
 
-def check_and_create_folder(path: Path):
-    """Check if a folder exist and if not create it
 
-    Args:
-        path (Path): path of the folder
+def bytes_with_unit(value, base=10):
+    """Convert bits to a readable format with a unit
+
+    Raises:
+        ValueError: if the value is nan or infinite
     """
-    if not (path.exists() and path.is_dir()):
-        os.makedirs(path, exist_ok=True)
+    if not math.isfinite(value):
+        raise ValueError(f"Cannot format a non-finite size: {value}")
+    units, divisor = (_DECIMAL_UNITS, 1000) if base == 10 else (_BINARY_UNITS, 1024)
+    if value < divisor:
+        return f"{value:.2f} {units[0]}"
 
+    # The logarithm picks the unit directly instead of dividing step by step
+    exponent = min(int(math.log(value, divisor)), len(units) - 1)
+    # Float rounding of the logarithm can be off by one next to a power of the divisor.
+    # The unit is chosen by exact comparison, so a value just below a power keeps the
+    # smaller unit and may round to "1000.00" of it
+    if value < divisor**exponent:
+        exponent -= 1
+    elif exponent < len(units) - 1 and value >= divisor ** (exponent + 1):
+        exponent += 1
+    return f"{value / divisor**exponent:.2f} {units[exponent]}"
 
-def bytes_with_unit(value, base=10):
-    """Convert bits to a readable format with a unit"""
-    bytes_ = value
 
-    if base == 10:
-        # Decimal units
-        units = ["Bytes", "KB", "MB", "GB", "TB", "PB", "EB"]
-        divisor = 1000
-    else:
-        # Binary units
-        units = ["Bytes", "KiB", "MiB", "GiB", "TiB", "PiB", "EiB"]
-        divisor = 1024
+def url_cache_path(cache_folder: Path, url: str) -> Path:
+    """Path inside the cache folder that mirrors the host and path of a URL"""
+    parts = urlsplit(url)
+    return Path(cache_folder) / parts.netloc.replace(":", "_") / parts.path.lstrip("/")
+
+
+def write_atomic(path: Path, data: bytes):
+    """Write a file through a temporary file so readers never see partial content
+
+    Args:
+        path (Path): destination of the file
+        data (bytes): file content
+    """
+    os.makedirs(path.parent, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        # Do not leave the temporary file behind when writing fails or is interrupted
+        if temp_path.exists():
+            temp_path.unlink()
+        raise
+
+
+def download_chunk_size(total_size: int) -> int:
+    """Pick the read size for a download based on its total size
 
-    for unit in units:
-        if bytes_ < divisor:
-            return f"{bytes_:.2f} {unit}"
-        bytes_ /= divisor
-    return f"{bytes_:.2f} {units[-1]}"
+    Args:
+        total_size (int): size of the download in bytes, 0 if unknown
+    """
+    return max(
+        DOWNLOAD_MIN_CHUNK_SIZE, min(total_size // 100, DOWNLOAD_MAX_CHUNK_SIZE)
+    )
 
 
-def run_command(command):
+def run_command(command, timeout=COMMAND_TIMEOUT):
     """Runs a shell command and returns the output
 
     Args:
         command (str, seq(str)): A string, or a sequence of program arguments
+        timeout (float, optional): seconds after which the command is killed
+
+    Raises:
+        subprocess.TimeoutExpired: if the command does not finish in time
     """
-    with subprocess.Popen(
-        command, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-    ) as process:
-        output, error = process.communicate()
-        output = output.decode("utf-8")
-        error = error.decode("utf-8")
-    return output, error
+    import subprocess
+
+    process = subprocess.run(
+        command,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        timeout=timeout,
+        check=False,
+    )
+    return process.stdout, process.stderr
 
 
-def download_progress(block_num, block_size, total_size):
-    """
-    Callback function that prints the download progress.
+class DownloadProgress:
+    """Prints a single status line that sums up all running downloads
+
+    Concurrent downloads share the line instead of overwriting each other,
+    messages are printed above it.
     """
-    downloaded = block_num * block_size
-    progress = 100 * downloaded / total_size
-    sys.stdout.write(f"\rDownloading: {progress:.2f}%")
-    sys.stdout.flush()
+
+    def __init__(self, interval=PROGRESS_INTERVAL):
+        self.interval = interval
+        self._downloads = {}
+        self._last_draw = 0.0
+        self._line_length = 0
+        self._lock = threading.Lock()
+
+    def start(self, name, total_size):
+        """Register a running download, total_size is 0 if unknown"""
+        with self._lock:
+            self._downloads[name] = [0, total_size]
+            self._draw()
+
+    def update(self, name, downloaded):
+        """Record the progress of a download, redrawn at most once per interval"""
+        with self._lock:
+            self._downloads[name][0] = downloaded
+            # Limit console updates, writing on every chunk slows the downloads
+            now = time.monotonic()
+            if now - self._last_draw >= self.interval:
+                self._last_draw = now
+                self._draw()
+
+    def finish(self, name):
+        """Remove a download from the status line"""
+        with self._lock:
+            if self._downloads.pop(name, None) is not None:
+                self._draw()
+
+    def message(self, text):
+        """Print a message on its own line above the status line"""
+        with self._lock:
+            self._write(text)
+            sys.stdout.write("\n")
+            self._line_length = 0
+            self._draw()
+
+    def _status(self):
+        if len(self._downloads) == 1:
+            ((name, (downloaded, total_size)),) = self._downloads.items()
+        else:
+            name = f"{len(self._downloads)} versions"
+            downloaded = sum(size[0] for size in self._downloads.values())
+            total_size = sum(size[1] for size in self._downloads.values())
+            if not all(size[1] for size in self._downloads.values()):
+                total_size = 0
+        if total_size:
+            return f"Downloading {name}: {100 * downloaded / total_size:.2f}%"
+        return f"Downloading {name}: {bytes_with_unit(downloaded)}"
+
+    def _write(self, text):
+        # Pad with spaces to overwrite the rest of a longer previous line
+        padding = " " * (self._line_length - len(text))
+        sys.stdout.write(f"\r{text}{padding}")
+        self._line_length = len(text)
+
+    def _draw(self):
+        if self._downloads or self._line_length:
+            self._write(self._status() if self._downloads else "")
+        sys.stdout.flush()
+
+
+_PROGRESS = DownloadProgress()
+
+
+def proxy_auth_headers(proxy) -> dict:
+    """Basic authentication headers for the credentials of a parsed proxy URL"""
+    if proxy.username is None:
+        return {}
+    credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+class DownloadError(Exception):
+    """Raised when a server jar cannot be downloaded or does not match its checksum"""
+
+
+class HTTPClient:
+    """Small HTTP client that keeps connections alive and reuses them per host"""
+
+    def __init__(
+        self, maxsize=META_FETCH_WORKERS, timeout=HTTP_TIMEOUT, headers=None
+    ):
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        # One context for all connections, created on first use because loading
+        # the CA certificates is too slow to do when the module is imported
+        self._ssl_context = None
+        # Proxy settings of the environment, like urlopen honors them, read on first use
+        self._proxies = None
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _get_ssl_context(self):
+        import ssl
+
+        with self._lock:
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            return self._ssl_context
+
+    def _get_proxy(self, scheme, netloc):
+        """The proxy to use for a host, None to connect directly"""
+        import urllib.request
+
+        with self._lock:
+            if self._proxies is None:
+                self._proxies = urllib.request.getproxies()
+        proxy = self._proxies.get(scheme)
+        if not proxy or urllib.request.proxy_bypass(netloc):
+            return None
+        return urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    def _new_connection(self, scheme, netloc):
+        import http.client
+
+        proxy = self._get_proxy(scheme, netloc)
+        if scheme == "https":
+            if proxy is None:
+                return http.client.HTTPSConnection(
+                    netloc, timeout=self.timeout, context=self._get_ssl_context()
+                )
+            connection = http.client.HTTPSConnection(
+                proxy.hostname,
+                proxy.port,
+                timeout=self.timeout,
+                context=self._get_ssl_context(),
+            )
+            connection.set_tunnel(netloc, headers=proxy_auth_headers(proxy))
+            return connection
+        if proxy is None:
+            return http.client.HTTPConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(
+            proxy.hostname, proxy.port, timeout=self.timeout
+        )
+
+    def _acquire(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(scheme, netloc), False
+
+    def _release(self, scheme, netloc, connection, response):
+        """Return the connection to the pool if its response was fully consumed"""
+        if response.isclosed() and not response.will_close:
+            with self._lock:
+                idle = self._idle.setdefault((scheme, netloc), [])
+                if len(idle) < self.maxsize:
+                    idle.append(connection)
+                    return
+        connection.close()
+
+    def _send(self, scheme, netloc, target, headers):
+        connection, reused = self._acquire(scheme, netloc)
+        try:
+            connection.request("GET", target, headers=headers)
+            return connection, connection.getresponse()
+        except ConnectionError:  # includes http.client.RemoteDisconnected
+            connection.close()
+            if not reused:
+                raise
+        # The server closed the idle keep-alive connection, retry on a new one
+        connection = self._new_connection(scheme, netloc)
+        connection.request("GET", target, headers=headers)
+        return connection, connection.getresponse()
+
+    @contextmanager
+    def request(self, url: str, headers=None):
+        """Send a GET request and yield the response
+
+        The connection is kept for later requests if the body was read completely.
+
+        Args:
+            url (str): URL to request
+            headers (dict, optional): additional request headers
+
+        Raises:
+            ValueError: if the URL is not an http or https URL
+            HTTPError: if the server answers with an error status
+        """
+        import http.client
+
+        headers = {**self.headers, **(headers or {})}
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                raise ValueError(f"unknown url type: {url!r}")
+            target = parts.path or "/"
+            if parts.query:
+                target += f"?{parts.query}"
+            request_headers = headers
+            proxy = parts.scheme == "http" and self._get_proxy("http", parts.netloc)
+            if proxy:
+                # Plain HTTP proxies expect the absolute URL as request target
+                target = f"http://{parts.netloc}{target}"
+                request_headers = {**headers, **proxy_auth_headers(proxy)}
+            connection, response = self._send(
+                parts.scheme, parts.netloc, target, request_headers
+            )
+            location = response.getheader("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.read()
+                self._release(parts.scheme, parts.netloc, connection, response)
+                url = urljoin(url, location)
+                continue
+            break
+        else:
+            raise http.client.HTTPException(f"Too many redirects for {url}")
+
+        if response.status >= 400:
+            connection.close()
+            raise HTTPError(url, response.status, response.reason, response.msg, None)
+        try:
+            yield response
+        finally:
+            self._release(parts.scheme, parts.netloc, connection, response)
+
+    def get(self, url: str, headers=None) -> bytes:
+        """Send a GET request and return the response body"""
+        with self.request(url, headers) as response:
+            return response.read()
+
+
+_HTTP = HTTPClient()
 
 
 class MinecraftServer:
     """Represents a Minecraft server file with functionality to manage it"""
 
-    def __init__(self, version: str, release_type: str, meta_url: str, path=None):
+    # The manifest creates one instance per version, slots keep them small
+    __slots__ = (
+        "version",
+        "type",
+        "meta_url",
+        "_data",
+        "_server_url",
+        "_server_file_size",
+        "_server_sha1",
+        "_client_file_size",
+        "_java_version",
+        "_minimum_launcher_version",
+        "server_folder",
+        "_server_file_path",
+        "http_client",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        version: str,
+        release_type: str,
+        meta_url: str,
+        path=None,
+        http_client: HTTPClient = None,
+    ):
         self.version = version
         self.type = release_type
         self.meta_url = meta_url
         self._data = None
-        self.server_folder = Path(path) or Path("server_versions")
+        self._server_url = None
+        self._server_file_size = None
+        self._server_sha1 = None
+        self._client_file_size = None
+        self._java_version = None
+        self._minimum_launcher_version = None
+        if not path:
+            self.server_folder = DEFAULT_SERVER_FOLDER
+        elif isinstance(path, Path):
+            # Shared by all versions of a manifest, no need to copy it
+            self.server_folder = path
+        else:
+            self.server_folder = Path(path)
+        self._server_file_path = self.server_folder / f"minecraft_server.{version}.jar"
+        self.http_client = http_client or _HTTP
 
     def __str__(self):
         return f"MinecraftServer({self.version=}, {self.type=})"
@@ -94,57 +425,118 @@ class MinecraftServer:
     @property
     def server_file_path(self):
         """The file path of the server jar file."""
-        return self.server_folder / f"minecraft_server.{self.version}.jar"
+        return self._server_file_path
 
     @property
     def server_url(self) -> str:
         """The URL from which the server jar file can be downloaded"""
-        if self._data is None:
-            self._update_data()
-        return self._data.get("downloads", {}).get("server", {}).get("url", "")
+        self._ensure_data()
+        return self._server_url
 
     @property
     def server_file_size(self) -> int:
         """Returns the server file size in bits"""
-        if self._data is None:
-            self._update_data()
-        return self._data.get("downloads", {}).get("server", {}).get("size", "")
+        self._ensure_data()
+        return self._server_file_size
+
+    @property
+    def server_sha1(self) -> str:
+        """The SHA1 checksum of the server jar file"""
+        self._ensure_data()
+        return self._server_sha1
 
     @property
     def client_file_size(self) -> int:
         """Returns the client file size in bits"""
-        if self._data is None:
-            self._update_data()
-        return self._data.get("downloads", {}).get("client", {}).get("size", "")
+        self._ensure_data()
+        return self._client_file_size
 
     @property
     def java_version(self) -> int:
         """The required Java version for the server"""
-        if self._data is None:
-            self._update_data()
-        return self._data.get("javaVersion", {}).get("majorVersion", -1)
+        self._ensure_data()
+        return self._java_version
 
     @property
     def minimum_launcher_version(self) -> int:
         """The minimum launcher version required by the client"""
+        self._ensure_data()
+        return self._minimum_launcher_version
+
+    def _ensure_data(self):
+        """Private method that loads the server metadata on first use
+
+        The parsed values live in slots, cached_property would need a __dict__.
+        """
         if self._data is None:
             self._update_data()
-        return self._data.get("minimumLauncherVersion", -1)
 
     def _update_data(self):
-        """Private method to update the server metadata by fetching it from the meta_url"""
-        with requests.urlopen(self.meta_url) as request:
-            self._data = json.load(request)
+        """Private method to update the server metadata by fetching it from the meta_url
+
+        The meta_url is content addressed, so a cached copy never goes stale.
+        """
+        cache_path = url_cache_path(
+            self.server_folder / CACHE_FOLDER_NAME, self.meta_url
+        )
+        if cache_path.exists():
+            body = cache_path.read_bytes()
+        else:
+            body = self.http_client.get(self.meta_url)
+            write_atomic(cache_path, body)
+        data = _json.loads(body)
+
+        # Walk the nested metadata once so the properties are plain attribute reads
+        downloads = data.get("downloads", {})
+        server = downloads.get("server", {})
+        self._server_url = server.get("url", "")
+        self._server_file_size = server.get("size", "")
+        self._server_sha1 = server.get("sha1", "")
+        self._client_file_size = downloads.get("client", {}).get("size", "")
+        self._java_version = data.get("javaVersion", {}).get("majorVersion", -1)
+        self._minimum_launcher_version = data.get("minimumLauncherVersion", -1)
+        # Set last, other threads treat a non None _data as fully loaded
+        self._data = data
 
     def download_server(self):
         """Downloads the server jar file to the specified server_folder"""
-        check_and_create_folder(self.server_folder)
         if not self.server_file_path.exists():
-            print(f"Downloading minecraft_server.{self.version}.jar file...")
-            requests.urlretrieve(
-                self.server_url, self.server_file_path, download_progress
+            if not self.server_url:
+                raise DownloadError(
+                    f"Version {self.version} has no server jar to download"
+                )
+            os.makedirs(self.server_folder, exist_ok=True)
+            _PROGRESS.message(f"Downloading {self.server_file_path.name} file...")
+            # Download to a temporary file so an aborted or corrupt download
+            # is never mistaken for a finished jar on the next run
+            temp_path = self.server_file_path.with_name(
+                f"{self.server_file_path.name}.part"
             )
-        print("\nDownload done")
+            checksum = hashlib.sha1()
+            try:
+                with self.http_client.request(self.server_url) as response, open(
+                    temp_path, "wb", buffering=0
+                ) as file:
+                    total_size = int(response.headers.get("Content-Length", 0))
+                    chunk_size = download_chunk_size(total_size)
+                    downloaded = 0
+                    _PROGRESS.start(self.version, total_size)
+                    while chunk := response.read(chunk_size):
+                        file.write(chunk)
+                        checksum.update(chunk)
+                        downloaded += len(chunk)
+                        _PROGRESS.update(self.version, downloaded)
+                if self.server_sha1 and checksum.hexdigest() != self.server_sha1:
+                    raise DownloadError(
+                        f"Checksum mismatch for {self.server_file_path.name}: "
+                        f"expected {self.server_sha1}, got {checksum.hexdigest()}"
+                    )
+                os.replace(temp_path, self.server_file_path)
+            finally:
+                _PROGRESS.finish(self.version)
+                if temp_path.exists():
+                    temp_path.unlink()
+        _PROGRESS.message(f"Download of {self.version} done")
 
     def check_java(self):
         """Check if the system has the required java version"""
@@ -160,6 +552,7 @@ class MinecraftServer:
             f"\tjava_version: {self.java_version}\n"
             f"\tminimum_launcher_version: {self.minimum_launcher_version}\n"
             f"\tserver_url: {self.server_url}\n"
+            f"\tserver_sha1: {self.server_sha1}\n"
             f"\tserver_file_size: {bytes_with_unit(self.server_file_size)}\n"
             f"\tclient_file_size: {bytes_with_unit(self.client_file_size)}\n"
             f"\tmeta_url: {self.meta_url}"
@@ -167,64 +560,265 @@ class MinecraftServer:
         print(msg)
 
 
-def get_version_manifest(url: str) -> dict:
+def fetch_cached(url: str, cache_folder, http_client: HTTPClient = None):
+    """Download a URL into the cache folder, revalidating a cached copy with its ETag
+
+    Returns:
+        tuple(Path, str): path of the cached file and its ETag (None if not sent)
+    """
+    cache_path = url_cache_path(cache_folder, url)
+    etag_path = cache_path.with_name(f"{cache_path.name}.etag")
+    headers = {}
+    if cache_path.exists() and etag_path.exists():
+        headers["If-None-Match"] = etag_path.read_text(encoding="utf-8")
+    with (http_client or _HTTP).request(url, headers) as response:
+        body = response.read()
+        etag = response.getheader("ETag")
+    if response.status == 304:
+        return cache_path, headers["If-None-Match"]
+
+    write_atomic(cache_path, body)
+    if etag:
+        write_atomic(etag_path, etag.encode("utf-8"))
+    elif etag_path.exists():
+        etag_path.unlink()
+    return cache_path, etag
+
+
+@functools.lru_cache(maxsize=4)
+def _get_manifest_body(url: str, http_client: HTTPClient, cache_folder) -> bytes:
+    """Private helper that memoizes the raw manifest for the lifetime of the process"""
+    if cache_folder is None:
+        return (http_client or _HTTP).get(url)
+    cache_path, _ = fetch_cached(url, cache_folder, http_client)
+    return cache_path.read_bytes()
+
+
+def get_version_manifest(
+    url: str, http_client: HTTPClient = None, cache_folder=None
+) -> dict:
     """
     Download the minecraft manifest with the client and server versions
+
+    If a cache_folder is given the manifest is stored there together with its ETag
+    and only downloaded again when the server reports a change.
+    The download is memoized for the process, every call parses a fresh dict from it.
+    Use clear_manifest_cache() to fetch the manifest again.
     """
-    with requests.urlopen(url) as request:
-        data = json.load(request)
-    return data
+    return _json.loads(_get_manifest_body(url, http_client, cache_folder))
+
+
+def _is_version_table(entries, latest) -> bool:
+    """Check the shape of the pickled version entries and latest versions"""
+    return (
+        isinstance(entries, list)
+        and all(
+            isinstance(entry, tuple)
+            and len(entry) == 3
+            and all(isinstance(field, str) for field in entry)
+            for entry in entries
+        )
+        and isinstance(latest, dict)
+        and all(isinstance(value, str) for value in latest.values())
+    )
 
 
-def manifest_extract_meta(manifest: dict, server_folder) -> dict:
+def _add_latest_aliases(results: dict, latest: dict):
+    """Add the "latest_release" and "latest_snapshot" entries to parsed versions"""
+    results["latest_release"] = results.get(latest.get("release", None), None)
+    results["latest_snapshot"] = results.get(latest.get("snapshot", None), None)
+
+
+def manifest_extract_meta(
+    manifest: dict, server_folder, http_client: HTTPClient = None
+) -> dict:
     """Parse the manifest"""
     results = {}
-    for version in manifest.get("versions", []):
-        results[version["id"]] = MinecraftServer(
-            version=version["id"],
-            release_type=version["type"],
-            meta_url=version["url"],
-            path=server_folder,
+    # Local names avoid global lookups in the loop over hundreds of versions
+    server_class = MinecraftServer
+    server_folder = Path(server_folder) if server_folder else DEFAULT_SERVER_FOLDER
+    for version in manifest.get("versions", ()):
+        version_id = version["id"]
+        results[version_id] = server_class(
+            version_id, version["type"], version["url"], server_folder, http_client
         )
-    latest = manifest.get("latest", {})
-    results["latest_release"] = results.get(latest.get("release", None), None)
-    results["latest_snapshot"] = results.get(latest.get("snapshot", None), None)
+    _add_latest_aliases(results, manifest.get("latest", {}))
     return results
 
 
+@functools.lru_cache(maxsize=4)
+def load_versions(
+    url: str, server_folder, http_client: HTTPClient = None
+) -> MappingProxyType:
+    """Get the manifest and create a MinecraftServer for each version
+
+    The extracted (version, type, meta_url) entries are pickled next to the cached
+    manifest, so as long as its ETag is unchanged the JSON is not parsed again.
+    The read-only result is memoized for the process, so later commands share the
+    servers and their already loaded metadata. Use clear_manifest_cache() to reload.
+    """
+    import pickle
+
+    server_folder = Path(server_folder) if server_folder else DEFAULT_SERVER_FOLDER
+    cache_folder = server_folder / CACHE_FOLDER_NAME
+    manifest_path, etag = fetch_cached(url, cache_folder, http_client)
+    pickle_path = manifest_path.with_name(f"{manifest_path.name}.pkl")
+    entries = None
+    if etag and pickle_path.exists():
+        # Unpickling can run code, so this trusts the cache inside the server folder
+        # just like the jars stored next to it. A damaged or outdated file is only
+        # ignored, the JSON below rebuilds it.
+        try:
+            with open(pickle_path, "rb") as file:
+                cached_etag, entries, latest = pickle.load(file)
+        except Exception:  # unpickling can fail with almost any error type
+            cached_etag = entries = latest = None
+        if cached_etag != etag or not _is_version_table(entries, latest):
+            entries = None
+
+    if entries is None:
+        manifest = _json.loads(manifest_path.read_bytes())
+        entries = [
+            (version["id"], version["type"], version["url"])
+            for version in manifest.get("versions", ())
+        ]
+        latest = manifest.get("latest", {})
+        # Only the entries are used from here on, drop the full manifest before
+        # the servers are created so both never have to be held at once
+        del manifest
+        if etag:
+            write_atomic(
+                pickle_path,
+                pickle.dumps((etag, entries, latest), protocol=pickle.HIGHEST_PROTOCOL),
+            )
+
+    results = {}
+    server_class = MinecraftServer
+    for version_id, release_type, meta_url in entries:
+        results[version_id] = server_class(
+            version_id, release_type, meta_url, server_folder, http_client
+        )
+    _add_latest_aliases(results, latest)
+    return MappingProxyType(results)
+
+
+def clear_manifest_cache():
+    """Forget the manifests and versions memoized in this process"""
+    _get_manifest_body.cache_clear()
+    load_versions.cache_clear()
+
+
+def manifest_fetch_meta(servers, max_workers=META_FETCH_WORKERS):
+    """Fetch the metadata of several servers concurrently
+
+    Failures are reported per server instead of aborting the other requests.
+
+    Args:
+        servers (iterable(MinecraftServer)): servers whose metadata should be loaded
+        max_workers (int, optional): number of parallel requests
+
+    Returns:
+        list(MinecraftServer): servers whose metadata could not be loaded
+    """
+    import http.client
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    # dict.fromkeys drops aliases like "latest_release" while keeping the order
+    pending = [
+        server
+        for server in dict.fromkeys(servers)
+        if server is not None and server._data is None
+    ]
+    if not pending:
+        return []
+    # Connections beyond the client's pool size are closed after use instead of
+    # being kept alive, so a larger max_workers would only add handshakes
+    max_workers = min(max_workers, pending[0].http_client.maxsize, len(pending))
+    failed = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(server._update_data): server for server in pending}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (OSError, http.client.HTTPException, ValueError) as error:
+                server = futures[future]
+                _PROGRESS.message(
+                    f"Loading the metadata of {server.version} failed: {error}"
+                )
+                failed.append(server)
+    return failed
+
+
+def select_versions(versions: dict, names) -> list:
+    """Look up the requested versions and report the ones that do not exist
+
+    Args:
+        versions (dict): versions as returned by load_versions
+        names (str, seq(str)): a single version name or a sequence of them
+    """
+    if isinstance(names, str):
+        names = [names]
+    servers = []
+    for name in names:
+        if name in versions:
+            servers.append(versions[name])
+        else:
+            print(
+                f"{name} is not a valid Version. Try 'latest_release' for the newest stable version"
+            )
+    return servers
+
+
 def cmd_update(**kwargs):
     """Get the newest release or snapshot version based on running server"""
     print(f"{kwargs=}")
     raise NotImplementedError()
 
 
-def cmd_download(version, **kwargs):
-    """Command to download a specific server jar"""
+def cmd_download(version, concurrency=DOWNLOAD_WORKERS, **kwargs):
+    """Command to download one or more server jars"""
+    import http.client
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
     print("Downloading manifest")
-    manifest = get_version_manifest(DEFAULT_MANIFEST_URL)
-    versions = manifest_extract_meta(manifest, kwargs["folder"])
-    if version in versions:
-        versions[version].download_server()
-    else:
-        print(
-            f"{version} is not a valid Version. Try 'latest_release' for the newest stable version"
-        )
+    versions = load_versions(DEFAULT_MANIFEST_URL, kwargs["folder"])
+    # Aliases like "latest_release" must not download the same jar twice
+    servers = list(dict.fromkeys(select_versions(versions, version)))
+    if not servers:
+        return
+    failed = manifest_fetch_meta(servers)
+    servers = [server for server in servers if server not in failed]
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {
+            executor.submit(server.download_server): server for server in servers
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except (DownloadError, OSError, http.client.HTTPException) as error:
+                server = futures[future]
+                _PROGRESS.message(f"Download of {server.version} failed: {error}")
+                failed.append(server)
+    if failed:
+        sys.exit(f"{len(failed)} download(s) failed")
 
 
 def cmd_info(version, **kwargs):
-    """Command get information about a version"""
+    """Command get information about one or more versions"""
     print("Downloading manifest")
-    manifest = get_version_manifest(DEFAULT_MANIFEST_URL)
-    versions = manifest_extract_meta(manifest, kwargs["folder"])
-    if version in versions:
-        versions[version].print_info()
-    else:
-        print(
-            f"{version} is not a valid Version. Try 'latest_release' for the newest stable version"
-        )
+    versions = load_versions(DEFAULT_MANIFEST_URL, kwargs["folder"])
+    servers = select_versions(versions, version)
+    failed = manifest_fetch_meta(servers)
+    for server in servers:
+        if server not in failed:
+            server.print_info()
+    if failed:
+        sys.exit(f"Could not get the info of {len(failed)} version(s)")
 
 
 if __name__ == "__main__":
+    import argparse
+
     # Create the top-level parser
     parser = argparse.ArgumentParser(prog="msm")
     parser.add_argument(
@@ -245,14 +839,24 @@ if __name__ == "__main__":
     parser_download = subparsers.add_parser(
         "download", help="download a specific server version"
     )
-    parser_download.add_argument("version", type=str, help="Version to download")
+    parser_download.add_argument(
+        "version", type=str, nargs="+", help="Versions to download"
+    )
+    parser_download.add_argument(
+        "--concurrency",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help="Number of server jars downloaded in parallel",
+    )
     parser_download.set_defaults(func=cmd_download)
 
     # Create the parser for the "info" command
     parser_info = subparsers.add_parser(
         "info", help="info for a specific server version"
     )
-    parser_info.add_argument("version", type=str, help="Version to get infos on")
+    parser_info.add_argument(
+        "version", type=str, nargs="+", help="Versions to get infos on"
+    )
     parser_info.set_defaults(func=cmd_info)
 
     args = parser.parse_args()